@@ -1,45 +1,89 @@
 # src/analytics/logger.py
 from __future__ import annotations
 import csv
+import io
 import os
-from typing import Dict, Iterable, List
+from typing import BinaryIO, Dict, Iterable, List, Optional
 
 from .metrics import RunMetrics
 
 
+def _rows_to_csv_bytes(rows: Iterable[Dict[str, object]], fieldnames: List[str], header: bool = False) -> bytes:
+    """Format rows (optionally preceded by the header) into one UTF-8 CSV buffer."""
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    if header:
+        writer.writerow(fieldnames)
+    writer.writerows([row[k] for k in fieldnames] for row in rows)
+    return buf.getvalue().encode("utf-8")
+
+
 class CSVLogger:
     """
     Appends RunMetrics rows into a CSV file.
     Creates the file with header if it doesn't exist.
+
+    Rows are formatted in memory and appended with a single write per batch:
+    log_many() writes its rows at once, and log() queues rows until
+    `flush_every` are pending. The file is opened once (on the first write).
+    Call close() (or flush()), or use the logger as a context manager, so
+    queued rows land; as a fallback, a logger that is garbage-collected while
+    still open writes its queued rows then.
     """
 
-    def __init__(self, csv_path: str):
+    def __init__(self, csv_path: str, flush_every: int = 64):
         self.csv_path = csv_path
+        self.flush_every = flush_every
         os.makedirs(os.path.dirname(csv_path), exist_ok=True)
+        self._fh: Optional[BinaryIO] = None
+        self._fieldnames: Optional[List[str]] = None
+        self._pending: List[Dict[str, object]] = []
+        # stat once; afterwards the header state is tracked here
+        self._header_written = os.path.exists(csv_path) and os.path.getsize(csv_path) > 0
+
+    def __enter__(self) -> "CSVLogger":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-    def _ensure_header(self, fieldnames: List[str]) -> None:
-        if os.path.exists(self.csv_path) and os.path.getsize(self.csv_path) > 0:
+    def _write(self, rows: List[Dict[str, object]]) -> None:
+        if not rows:
             return
-        with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        if self._fh is None:
+            self._fh = open(self.csv_path, "ab")
+        if self._fieldnames is None:
+            self._fieldnames = list(rows[0].keys())
+        self._fh.write(_rows_to_csv_bytes(rows, self._fieldnames, header=not self._header_written))
+        self._header_written = True
+
+    def _drain(self) -> None:
+        rows, self._pending = self._pending, []
+        self._write(rows)
 
     def log(self, metrics: RunMetrics) -> None:
-        row = metrics.to_row()
-        fieldnames = list(row.keys())
-        self._ensure_header(fieldnames)
-        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writerow(row)
+        self._pending.append(metrics.to_row())
+        if len(self._pending) >= self.flush_every:
+            self._drain()
 
     def log_many(self, metrics_list: Iterable[RunMetrics]) -> None:
-        metrics_list = list(metrics_list)
-        if not metrics_list:
-            return
-        first = metrics_list[0].to_row()
-        fieldnames = list(first.keys())
-        self._ensure_header(fieldnames)
-        with open(self.csv_path, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            for m in metrics_list:
-                writer.writerow(m.to_row())
\ No newline at end of file
+        # queued log() rows go first so the file keeps call order
+        rows, self._pending = self._pending, []
+        rows.extend(m.to_row() for m in metrics_list)
+        self._write(rows)
+
+    def flush(self) -> None:
+        self._drain()
+        if self._fh is not None:
+            self._fh.flush()
+
+    def close(self) -> None:
+        self._drain()
+        if self._fh is not None:
+            self._fh.close()
+        self._fh = None
+
+    def __del__(self) -> None:
+        # callers that log() without close() must not lose queued rows
+        if getattr(self, "_pending", None):
+            self.close()
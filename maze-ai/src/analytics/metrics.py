@@ -1,6 +1,6 @@
 # src/analytics/metrics.py
 from __future__ import annotations
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, fields
 from typing import Any, Dict, Optional
 
 
@@ -40,7 +40,9 @@ class RunMetrics:
     heuristic_evaluations: int = 0
     repeated_state_updates: int = 0  # A*: improved g for already-seen state
 
-    # Internal tracking for averages
+    # Internal tracking for averages: O(1) running aggregates, no per-step
+    # frontier trace is stored (solvers accumulate these in locals and hand
+    # them over once via record_frontier_stats)
     _frontier_total: int = 0
     _frontier_samples: int = 0
 
@@ -72,6 +74,12 @@ class RunMetrics:
         self._frontier_total += size
         self._frontier_samples += 1
 
+    def record_frontier_stats(self, maximum: int, total: int, samples: int) -> None:
+        """Fold in frontier stats a search kernel accumulated itself (same as `samples` record_frontier calls)."""
+        self.maximum_frontier_size = max(self.maximum_frontier_size, maximum)
+        self._frontier_total += total
+        self._frontier_samples += samples
+
     def finalize(self) -> None:
         # avg frontier
         if self._frontier_samples > 0:
@@ -86,7 +94,9 @@ class RunMetrics:
             self.path_cost_ratio = self.solution_cost / float(self.solution_path_length)
 
     def to_row(self) -> Dict[str, Any]:
-        row = asdict(self)
-        row.pop("_frontier_total", None)
-        row.pop("_frontier_samples", None)
-        return row
\ No newline at end of file
+        # all fields are scalars, so a shallow read is enough (no asdict deep copy)
+        return {k: getattr(self, k) for k in _PUBLIC_FIELDS}
+
+
+# CSV columns: every field except internal "_"-prefixed trackers
+_PUBLIC_FIELDS = tuple(f.name for f in fields(RunMetrics) if not f.name.startswith("_"))
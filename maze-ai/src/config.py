@@ -1,9 +1,17 @@
 # src/config.py
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 from utils.paths import OutputPaths
 
 
+@lru_cache(maxsize=None)
+def _default_paths() -> OutputPaths:
+    # create the output folders once per process; OutputPaths is frozen, so
+    # every Config can share the result
+    return OutputPaths().ensure()
+
+
 @dataclass
 class Config:
     """
@@ -35,7 +43,7 @@ class Config:
     # ---------------------------
     # Output Paths
     # ---------------------------
-    paths: OutputPaths = OutputPaths().ensure()
+    paths: OutputPaths = field(default_factory=_default_paths)
 
     @property
     def results_csv(self) -> str:
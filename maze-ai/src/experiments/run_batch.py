@@ -1,20 +1,85 @@
 # src/experiments/run_batch.py
 from __future__ import annotations
-import subprocess
+import argparse
+import contextlib
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Tuple
+
+# Ensure imports work when running: python src/experiments/run_batch.py
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from config import Config
+from analytics.logger import CSVLogger
+from analytics.metrics import RunMetrics
+from main import main as run_main, make_config, make_env, parse_args as parse_main_args
+from utils.jit import set_num_threads
 
 SIZES = [11, 31, 51, 81, 111]
 SEEDS = list(range(10))
 ALGOS = ["bfs", "dfs", "astar_manhattan", "astar_euclidean", "value", "policy"]
 
-def run():
-    for n in SIZES:
-        for seed in SEEDS:
-            for algo in ALGOS:
-                cmd = [sys.executable, "src/main.py", "--rows", str(n), "--cols", str(n),
-                       "--seed", str(seed), "--algo", algo]
-                print("RUN:", " ".join(cmd))
-                subprocess.run(cmd, check=True)
+
+def _algo_argv(n: int, seed: int, algo: str) -> List[str]:
+    return ["--rows", str(n), "--cols", str(n), "--seed", str(seed), "--algo", algo]
+
+
+def _init_worker() -> None:
+    # the pool already uses every core; a per-worker Numba thread pool for the
+    # parallel VI sweep would oversubscribe the machine
+    set_num_threads(1)
+
+
+def _run_maze(job: Tuple[int, int]) -> List[RunMetrics]:
+    """
+    Run every algorithm on one (size, seed) maze in-process, silencing the
+    per-run summaries. The maze, env and its MDP tables are built once and
+    shared by all algorithms.
+    """
+    n, seed = job
+    results: List[RunMetrics] = []
+    env = None
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        for algo in ALGOS:
+            args = parse_main_args(_algo_argv(n, seed, algo))
+            if env is None:
+                env = make_env(args, make_config(args))
+            results.append(run_main(args, log=False, env=env))
+    return results
+
+
+def _report(n: int, seed: int, metrics_list: List[RunMetrics], logger: CSVLogger) -> None:
+    for algo in ALGOS:
+        print("RUN:", " ".join(_algo_argv(n, seed, algo)))
+    logger.log_many(metrics_list)
+
+
+def run(jobs: int = 1):
+    mazes = [(n, seed) for n in SIZES for seed in SEEDS]
+
+    # Workers only compute; the parent is the single CSV writer.
+    with CSVLogger(Config().results_csv) as logger:
+        if jobs <= 1:
+            results = map(_run_maze, mazes)
+            for (n, seed), metrics_list in zip(mazes, results):
+                _report(n, seed, metrics_list, logger)
+            return
+
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as ex:
+            # map yields in submission order, so the CSV row order is deterministic
+            for (n, seed), metrics_list in zip(mazes, ex.map(_run_maze, mazes)):
+                _report(n, seed, metrics_list, logger)
+
+
+def parse_args():
+    p = argparse.ArgumentParser(description="Run the full maze experiment grid")
+    p.add_argument("--jobs", type=int, default=os.cpu_count() or 1,
+                   help="worker processes (1 = run serially in this process)")
+    return p.parse_args()
+
 
 if __name__ == "__main__":
-    run()
\ No newline at end of file
+    run(jobs=parse_args().jobs)
@@ -5,7 +5,8 @@ import argparse
 import os
 import sys
 import time
-import resource
+import tracemalloc
+from typing import List, Optional
 
 # Ensure imports work when running: python src/main.py ...
 THIS_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -23,12 +24,12 @@ from maze.env import MazeEnv
 from solvers.bfs import solve_bfs
 from solvers.dfs import solve_dfs
 from solvers.astar import solve_astar
-from solvers.value_iteration import solve_value_iteration
+from solvers.value_iteration import solve_value_iteration, warm_value_iteration
 from solvers.policy_iteration import solve_policy_iteration
 from utils.paths import frames_dir, image_path
 from maze.render_matplotlib import save_maze_png, save_progress_frames
 
-def parse_args():
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     p = argparse.ArgumentParser(description="CS7IS2 Maze Solver + Analytics")
 
     # Maze params
@@ -53,11 +54,10 @@ def parse_args():
     p.add_argument("--cell_px", type=int, default=None)
     p.add_argument("--anim_delay_ms", type=int, default=None)
 
-    return p.parse_args()
+    return p.parse_args(argv)
 
 
-def main():
-    args = parse_args()
+def make_config(args: argparse.Namespace) -> Config:
     cfg = Config()  # creates output folders via OutputPaths().ensure()
 
     # Override config if CLI flags provided
@@ -72,12 +72,15 @@ def main():
         cfg.cell_px = args.cell_px
     if args.anim_delay_ms is not None:
         cfg.anim_delay_ms = args.anim_delay_ms
+    return cfg
 
+
+def make_env(args: argparse.Namespace, cfg: Config) -> MazeEnv:
     # ---- generate maze (independent of solver) ----
     maze = generate_maze(rows=args.rows, cols=args.cols, seed=args.seed)
 
     # ---- build env ----
-    env = MazeEnv(
+    return MazeEnv(
         maze=maze,
         gamma=cfg.gamma,
         slip_prob=cfg.slip_prob,
@@ -86,6 +89,24 @@ def main():
         wall_reward=cfg.wall_reward,
     )
 
+
+def main(args: Optional[argparse.Namespace] = None, log: bool = True,
+         env: Optional[MazeEnv] = None) -> RunMetrics:
+    """
+    Run one experiment and return its metrics.
+    args defaults to the command line; log=False skips the CSV append
+    (run_batch collects metrics and writes them from the parent process).
+    env lets callers reuse one maze/env across algorithms; it must match
+    args.rows/cols/seed.
+    """
+    if args is None:
+        args = parse_args()
+    cfg = make_config(args)
+
+    if env is None:
+        env = make_env(args, cfg)
+    maze = env.maze
+
     # ---- init metrics ----
     metrics = RunMetrics(
         algorithm=args.algo,
@@ -94,7 +115,19 @@ def main():
         random_seed=args.seed,
     )
 
+    # MDP tables are cached on the env; build them outside the timed region so
+    # VI and PI are timed the same whether or not the env is shared.
+    if args.algo in ("value", "policy"):
+        env.build_model()
+    # the VI kernel is not compiled at import (see solvers/_numba_kernels.py); do it untimed here
+    if args.algo == "value":
+        warm_value_iteration(env)
+
     # ---- run solver ----
+    # tracemalloc sees only the solver's allocations (not maze/env setup), so the
+    # peak is per-algorithm even when run_batch runs many solvers in one process.
+    # It slows Python allocations, which is included in execution_time_ms.
+    tracemalloc.start()
     t0 = time.perf_counter()
 
     if args.algo == "bfs":
@@ -113,8 +146,10 @@ def main():
         raise ValueError(f"Unknown algo: {args.algo}")
 
     t1 = time.perf_counter()
+    _, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
     metrics.execution_time_ms = (t1 - t0) * 1000.0
-    metrics.peak_memory_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    metrics.peak_memory_kb = peak_bytes // 1024
 
     # ---- print analytics ----
     print("\n=== RUN SUMMARY ===")
@@ -147,9 +182,10 @@ def main():
 
     metrics.finalize()
     # ---- log CSV ----
-    logger = CSVLogger(cfg.results_csv)
-    logger.log(metrics)
-    print(f"\nSaved metrics -> {cfg.results_csv}")
+    if log:
+        with CSVLogger(cfg.results_csv) as logger:
+            logger.log(metrics)
+        print(f"\nSaved metrics -> {cfg.results_csv}")
 
     title = f"{metrics.algorithm} | {metrics.maze_rows}x{metrics.maze_cols} | seed={metrics.random_seed}"
 
@@ -179,7 +215,6 @@ def main():
         seed=metrics.random_seed,
         every=25,        # tune: smaller = more frames
         max_frames=180,  # avoid huge folders
-        dpi=160,
     )
     print(f"Saved progress frames -> {fd}")
 
@@ -194,6 +229,8 @@ def main():
     # renderer.animate(result.visited_order, result.path)
     # renderer.run()
 
+    return metrics
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
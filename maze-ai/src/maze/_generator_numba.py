@@ -0,0 +1,77 @@
+# src/maze/_generator_numba.py
+"""
+DFS-carving kernel for generate_maze, compiled with Numba when available.
+
+All randomness comes in as a pre-drawn `draws` array (one uint32 per carve
+step), so the compiled and pure-Python runs produce the same maze for a seed.
+"""
+from __future__ import annotations
+
+import numpy as np
+
+from utils.jit import njit
+
+# PICK[mask, :PICK_LEN[mask]] -> direction indices k (wall bit 1 << k) set in a 4-bit mask, low to high
+PICK = np.zeros((16, 4), dtype=np.uint8)
+PICK_LEN = np.zeros(16, dtype=np.uint8)
+for _mask in range(16):
+    _dirs = [k for k in range(4) if _mask & (1 << k)]
+    PICK[_mask, :len(_dirs)] = _dirs
+    PICK_LEN[_mask] = len(_dirs)
+del _mask, _dirs
+
+
+@njit(cache=True)
+def carve(walls, cols: int, start: int, draws: np.ndarray, dirs: np.ndarray) -> None:
+    """
+    Carve a perfect maze in place into `walls`, a flat row-major uint8 buffer
+    (bytearray or 1-D array, all walls set) of a grid with `cols` columns,
+    starting at flat cell index `start`. Wall bits: N=1, E=2, S=4, W=8.
+    dirs is generator.DIRS_ARR: rows (dr, dc, wall on current, wall on next)
+    in N, E, S, W order. Cells are handled by flat index i = r * cols + c.
+    """
+    n = len(walls)
+
+    # flat index step for each direction
+    step = np.empty(4, dtype=np.int64)
+    for d in range(4):
+        step[d] = np.int64(dirs[d, 0]) * cols + dirs[d, 1]
+    visited = np.zeros(n, dtype=np.bool_)
+
+    stack = np.empty(n, dtype=np.int32)
+    top = 0
+    stack[0] = start
+    visited[start] = True
+    k = 0
+
+    while top >= 0:
+        i = stack[top]
+        c = i % cols
+
+        # bitmask (N/E/S/W) of unvisited neighbors
+        mask = 0
+        if i >= cols and not visited[i - cols]:
+            mask |= 1
+        if c + 1 < cols and not visited[i + 1]:
+            mask |= 2
+        if i + cols < n and not visited[i + cols]:
+            mask |= 4
+        if c > 0 and not visited[i - 1]:
+            mask |= 8
+
+        if mask == 0:
+            top -= 1
+            continue
+
+        # uniform pick among the set bits: one table lookup, no neighbor list
+        d = PICK[mask, draws[k] % PICK_LEN[mask]]
+        k += 1
+        j = i + step[d]
+
+        # remove walls between current and next
+        walls[i] &= 15 ^ dirs[d, 2]
+        walls[j] &= 15 ^ dirs[d, 3]
+
+        visited[j] = True
+        top += 1
+        stack[top] = j
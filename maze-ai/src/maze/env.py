@@ -3,17 +3,43 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional, Tuple
 
-from .generator import Maze, N, E, S, W, has_wall
+import numpy as np
 
-Coord = Tuple[int, int]
+from .generator import DIRS, Maze, N, E, S, W
 
+Coord = Tuple[int, int]
 
-@dataclass(frozen=True)
+# OPEN_TABLE[mask] -> (dr, dc) steps for a 4-bit open-side mask, in N, E, S, W order
+OPEN_TABLE: Tuple[Tuple[Tuple[int, int], ...], ...] = tuple(
+    tuple((dr, dc) for dr, dc, bit, _ in DIRS if mask & bit) for mask in range(16)
+)
+
+# action -> (dr, dc, wall bit it crosses)
+_ACTION_LUT = {
+    "U": (-1, 0, N),
+    "R": (0, 1, E),
+    "D": (1, 0, S),
+    "L": (0, -1, W),
+}
+
+# Slip outcomes per action.
+# U side actions: L/R ; R side actions: U/D ; D side actions: L/R ; L side actions: U/D
+_SIDE_ACTIONS = {
+    "U": ("L", "R"),
+    "R": ("U", "D"),
+    "D": ("L", "R"),
+    "L": ("U", "D"),
+}
+
+
+@dataclass
 class MazeEnv:
     """
     Environment wrapper around Maze that provides:
       - neighbors() for graph search (DFS/BFS/A*)
       - MDP-style actions + transitions + rewards for Value/Policy iteration
+
+    Maze geometry is cached in __post_init__; treat the env as read-only.
     """
     maze: Maze
     step_reward: float = -0.01
@@ -24,9 +50,53 @@ class MazeEnv:
 
     ACTIONS: Tuple[str, ...] = ("U", "R", "D", "L")
 
+    def __post_init__(self) -> None:
+        self._walls = np.asarray(self.maze.walls, dtype=np.uint8)
+        self._rows = self.maze.rows
+        self._cols = self.maze.cols
+        self._goal = self.maze.goal
+        self.goal_idx = self.state_index(self.maze.goal)
+        self._model: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self.transitions = self._transitions_det if self.slip_prob <= 0.0 else self._transitions_slip
+
+        # open_mask[r, c]: sides you can step through (no wall, stays in bounds)
+        open_mask = ~self._walls & (N | E | S | W)
+        open_mask[0, :] &= ~np.uint8(N)
+        open_mask[-1, :] &= ~np.uint8(S)
+        open_mask[:, 0] &= ~np.uint8(W)
+        open_mask[:, -1] &= ~np.uint8(E)
+        self.open_mask = open_mask
+        self._open: List[int] = open_mask.ravel().tolist()  # flat Python ints for scalar lookups
+
+        # neighbor_table[i, d]: state index of i's open neighbor in direction d
+        # (N, E, S, W), or -1; read-only, for array/Numba code
+        n_states = self._rows * self._cols
+        flat_open = open_mask.ravel()
+        idx = np.arange(n_states, dtype=np.int32)
+        neighbor_table = np.full((n_states, 4), -1, dtype=np.int32)
+        for d, (dr, dc, bit, _) in enumerate(DIRS):
+            ok = (flat_open & bit) != 0
+            neighbor_table[ok, d] = idx[ok] + (dr * self._cols + dc)
+        neighbor_table.flags.writeable = False
+        self.neighbor_table = neighbor_table
+
+        # coords[i] is the cell of flat state i = state_index(cell)
+        self.coords: List[Coord] = list(self.states())
+
+        # neighbor_indices() / neighbors() results for every cell, indexed by state_index()
+        cols = self._cols
+        self._neighbor_idx_lut: List[Tuple[int, ...]] = [
+            tuple(i + dr * cols + dc for dr, dc in OPEN_TABLE[m]) for i, m in enumerate(self._open)
+        ]
+        # same tuples back to front, for DFS's stack pushes
+        self._neighbor_idx_rev_lut: List[Tuple[int, ...]] = [nbs[::-1] for nbs in self._neighbor_idx_lut]
+        self._neighbor_lut: List[Tuple[Coord, ...]] = [
+            tuple(self.coords[j] for j in nbs) for nbs in self._neighbor_idx_lut
+        ]
+
     def in_bounds(self, s: Coord) -> bool:
         r, c = s
-        return 0 <= r < self.maze.rows and 0 <= c < self.maze.cols
+        return 0 <= r < self._rows and 0 <= c < self._cols
 
     def is_goal(self, s: Coord) -> bool:
         return s == self.maze.goal
@@ -34,21 +104,17 @@ class MazeEnv:
     # ----------------------------
     # Search helpers (DFS/BFS/A*)
     # ----------------------------
-    def neighbors(self, s: Coord) -> List[Coord]:
-        """Return valid neighbor states (deterministic, no diagonals)."""
-        r, c = s
-        out: List[Coord] = []
+    def neighbors(self, s: Coord) -> Tuple[Coord, ...]:
+        """Return valid neighbor states (deterministic, no diagonals), in N, E, S, W order."""
+        return self._neighbor_lut[s[0] * self._cols + s[1]]
 
-        if not has_wall(self.maze, r, c, N) and r - 1 >= 0:
-            out.append((r - 1, c))
-        if not has_wall(self.maze, r, c, E) and c + 1 < self.maze.cols:
-            out.append((r, c + 1))
-        if not has_wall(self.maze, r, c, S) and r + 1 < self.maze.rows:
-            out.append((r + 1, c))
-        if not has_wall(self.maze, r, c, W) and c - 1 >= 0:
-            out.append((r, c - 1))
+    def neighbor_indices(self, i: int) -> Tuple[int, ...]:
+        """neighbors() by flat index: open neighbors of state i as state indices."""
+        return self._neighbor_idx_lut[i]
 
-        return out
+    def neighbor_indices_reversed(self, i: int) -> Tuple[int, ...]:
+        """neighbor_indices(i) in W, S, E, N order (cached; no per-call reversal)."""
+        return self._neighbor_idx_rev_lut[i]
 
     def cost(self, s: Coord, s2: Coord) -> float:
         """Uniform cost for search algorithms (unweighted graph)."""
@@ -58,30 +124,24 @@ class MazeEnv:
     # MDP helpers (Value/Policy)
     # ----------------------------
     def states(self) -> Iterable[Coord]:
-        for r in range(self.maze.rows):
-            for c in range(self.maze.cols):
+        for r in range(self._rows):
+            for c in range(self._cols):
                 yield (r, c)
 
+    def state_index(self, s: Coord) -> int:
+        """Flat row-major index of a state (same order as states())."""
+        return s[0] * self._cols + s[1]
+
     def _move(self, s: Coord, a: str) -> Coord:
-        """Deterministic move: if blocked by wall, you stay in place."""
+        """Deterministic move: if blocked by wall (or the border), you stay in place."""
+        try:
+            dr, dc, bit = _ACTION_LUT[a]
+        except KeyError:
+            raise ValueError(f"Unknown action: {a}") from None
         r, c = s
-        if a == "U":
-            if has_wall(self.maze, r, c, N) or r - 1 < 0:
-                return s
-            return (r - 1, c)
-        if a == "R":
-            if has_wall(self.maze, r, c, E) or c + 1 >= self.maze.cols:
-                return s
-            return (r, c + 1)
-        if a == "D":
-            if has_wall(self.maze, r, c, S) or r + 1 >= self.maze.rows:
-                return s
-            return (r + 1, c)
-        if a == "L":
-            if has_wall(self.maze, r, c, W) or c - 1 < 0:
-                return s
-            return (r, c - 1)
-        raise ValueError(f"Unknown action: {a}")
+        if not self._open[r * self._cols + c] & bit:
+            return s
+        return (r + dr, c + dc)
 
     def reward(self, s: Coord, a: str, s2: Coord) -> float:
         """Reward function for MDP."""
@@ -99,21 +159,25 @@ class MazeEnv:
         """
         Return list of (next_state, probability).
         If slip_prob > 0, action may slip to left/right (relative) with small probability.
+
+        __post_init__ rebinds this per instance to _transitions_det or
+        _transitions_slip, so the slip check is not repeated on every call.
         """
-        if self.is_goal(s):
+        if self.slip_prob <= 0.0:
+            return self._transitions_det(s, a)
+        return self._transitions_slip(s, a)
+
+    def _transitions_det(self, s: Coord, a: str) -> List[Tuple[Coord, float]]:
+        if s == self._goal:
             return [(s, 1.0)]
+        return [(self._move(s, a), 1.0)]
 
-        if self.slip_prob <= 0.0:
-            return [(self._move(s, a), 1.0)]
+    def _transitions_slip(self, s: Coord, a: str) -> List[Tuple[Coord, float]]:
+        if s == self._goal:
+            return [(s, 1.0)]
 
         # Optional stochasticity: intended action with 1-slip, plus two side actions split.
-        # U side actions: L/R ; R side actions: U/D ; D side actions: L/R ; L side actions: U/D
-        side = {
-            "U": ("L", "R"),
-            "R": ("U", "D"),
-            "D": ("L", "R"),
-            "L": ("U", "D"),
-        }[a]
+        side = _SIDE_ACTIONS[a]
 
         p_main = 1.0 - self.slip_prob
         p_side = self.slip_prob / 2.0
@@ -130,10 +194,44 @@ class MazeEnv:
 
         return list(probs.items())
 
-    def expected_return(self, V: Dict[Coord, float], s: Coord, a: str) -> float:
-        """One-step Bellman backup for Q(s,a) from V."""
-        total = 0.0
-        for s2, p in self.transitions(s, a):
-            r = self.reward(s, a, s2)
-            total += p * (r + self.gamma * V[s2])
-        return total
\ No newline at end of file
+    def expected_return(self, V: np.ndarray, s: Coord, a: str) -> float:
+        """One-step Bellman backup for Q(s,a) from a flat V indexed by state_index()."""
+        # read the cached tables instead of re-deriving transitions/rewards per call
+        P_next, P_prob, R = self.build_model()
+        i, ai = self.state_index(s), self.ACTIONS.index(a)
+        return float((P_prob[i, ai] * (R[i, ai] + self.gamma * V[P_next[i, ai]])).sum())
+
+    def build_model(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Tabulate transitions() and reward() once for vectorized Bellman backups.
+        Returns (P_next, P_prob, R), each of shape (S, A, K) with S = rows*cols
+        states indexed by state_index(), A = len(ACTIONS), and K = 1 outcome
+        when deterministic (3 with slip; unused outcomes have probability 0):
+          P_next[s, a, k] -> index of the k-th next state (int32)
+          P_prob[s, a, k] -> its probability
+          R[s, a, k]      -> reward for that transition
+        The tables are built on the first call, cached, and read-only.
+        """
+        if self._model is not None:
+            return self._model
+
+        n_states = self._rows * self._cols
+        n_outcomes = 1 if self.slip_prob <= 0.0 else 3
+        shape = (n_states, len(self.ACTIONS), n_outcomes)
+
+        P_next = np.zeros(shape, dtype=np.int32)
+        P_prob = np.zeros(shape, dtype=np.float64)
+        R = np.zeros(shape, dtype=np.float64)
+
+        for s in self.states():
+            i = self.state_index(s)
+            for ai, a in enumerate(self.ACTIONS):
+                for k, (s2, p) in enumerate(self.transitions(s, a)):
+                    P_next[i, ai, k] = self.state_index(s2)
+                    P_prob[i, ai, k] = p
+                    R[i, ai, k] = self.reward(s, a, s2)
+
+        for arr in (P_next, P_prob, R):
+            arr.flags.writeable = False
+        self._model = (P_next, P_prob, R)
+        return self._model
@@ -1,9 +1,14 @@
 # src/maze/generator.py
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import List, Tuple, Optional
+from typing import Tuple, Optional
 import random
 
+import numpy as np
+
+from utils.jit import HAVE_NUMBA
+from ._generator_numba import PICK, PICK_LEN, carve
+
 Coord = Tuple[int, int]
 
 
@@ -12,25 +17,78 @@ class Maze:
     """
     Perfect maze on a grid using 'cell walls' representation.
 
-    walls[r][c] is a 4-bit mask: N=1, E=2, S=4, W=8.
+    walls[r, c] is a 4-bit mask: N=1, E=2, S=4, W=8.
     If a bit is set, that wall exists.
+    walls is a uint8 ndarray of shape (rows, cols): a view over one flat
+    row-major buffer, so walls.ravel()[r * cols + c] is the same cell.
     """
     rows: int
     cols: int
-    walls: List[List[int]]
+    walls: np.ndarray
     start: Coord
     goal: Coord
 
 
 # Wall bit flags
 N, E, S, W = 1, 2, 4, 8
+ALL_WALLS = N | E | S | W
 
-DIRS = [
+DIRS = (
     (-1, 0, N, S),  # move up: remove N from current, S from next
     (0, 1, E, W),   # move right
     (1, 0, S, N),   # move down
     (0, -1, W, E),  # move left
-]
+)
+# Same table for array/Numba code; DIRS[k] has wall bit 1 << k
+DIRS_ARR = np.array(DIRS, dtype=np.int8)
+
+# PICK/PICK_LEN as nested tuples of Python ints for the interpreted carve
+_PICK = tuple(tuple(row) for row in PICK.tolist())
+_PICK_LEN = tuple(PICK_LEN.tolist())
+
+
+def _carve_py(walls: bytearray, cols: int, start: int, draws: np.ndarray) -> None:
+    """Interpreted _generator_numba.carve (used without Numba); same draws, same maze."""
+    n = len(walls)
+    draws = draws.tolist()
+    # per direction: flat index step and the masks clearing its wall on each side
+    step = tuple(dr * cols + dc for dr, dc, _, _ in DIRS)
+    keep = tuple(15 ^ wall for _, _, wall, _ in DIRS)
+    keep_next = tuple(15 ^ wall_next for _, _, _, wall_next in DIRS)
+    visited = bytearray(n)
+    stack = [start]
+    visited[start] = 1
+    k = 0
+
+    while stack:
+        i = stack[-1]
+        c = i % cols
+
+        # bitmask (N/E/S/W) of unvisited neighbors
+        mask = 0
+        if i >= cols and not visited[i - cols]:
+            mask |= 1
+        if c + 1 < cols and not visited[i + 1]:
+            mask |= 2
+        if i + cols < n and not visited[i + cols]:
+            mask |= 4
+        if c > 0 and not visited[i - 1]:
+            mask |= 8
+
+        if not mask:
+            stack.pop()
+            continue
+
+        d = _PICK[mask][draws[k] % _PICK_LEN[mask]]
+        k += 1
+        j = i + step[d]
+
+        # remove walls between current and next
+        walls[i] &= keep[d]
+        walls[j] &= keep_next[d]
+
+        visited[j] = 1
+        stack.append(j)
 
 
 def generate_maze(rows: int, cols: int, seed: Optional[int] = None,
@@ -38,47 +96,35 @@ def generate_maze(rows: int, cols: int, seed: Optional[int] = None,
     """
     Generate a perfect maze using iterative recursive backtracking (DFS carving).
     This is a GENERATOR ONLY — independent of BFS/DFS/A*/MDP solvers.
+    The carving loop is _generator_numba.carve when Numba is installed, else _carve_py.
     """
     if rows < 2 or cols < 2:
         raise ValueError("Maze must be at least 2x2.")
     if goal is None:
         goal = (rows - 1, cols - 1)
 
-    rng = random.Random(seed)
-
-    # Initialize all walls present
-    walls = [[N | E | S | W for _ in range(cols)] for _ in range(rows)]
-    visited = [[False for _ in range(cols)] for _ in range(rows)]
-
     sr, sc = start
-    stack = [(sr, sc)]
-    visited[sr][sc] = True
-
-    while stack:
-        r, c = stack[-1]
+    if not (0 <= sr < rows and 0 <= sc < cols):
+        raise ValueError("start must lie inside the maze.")
 
-        # collect unvisited neighbors
-        neigh = []
-        for dr, dc, w_curr, w_next in DIRS:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < rows and 0 <= nc < cols and not visited[nr][nc]:
-                neigh.append((nr, nc, w_curr, w_next))
-
-        if not neigh:
-            stack.pop()
-            continue
+    rng = random.Random(seed)
 
-        nr, nc, w_curr, w_next = rng.choice(neigh)
+    # Initialize all walls present, in one flat buffer indexed r * cols + c
+    buf = bytearray([ALL_WALLS]) * (rows * cols)
 
-        # remove walls between current and next
-        walls[r][c] &= ~w_curr
-        walls[nr][nc] &= ~w_next
+    # One random draw per carve step (a perfect maze has rows*cols - 1 passages),
+    # taken up front so the (optionally Numba-compiled) kernel needs no RNG object.
+    n_draws = rows * cols - 1
+    draws = np.frombuffer(rng.getrandbits(32 * n_draws).to_bytes(4 * n_draws, "little"), dtype="<u4")
 
-        visited[nr][nc] = True
-        stack.append((nr, nc))
+    if HAVE_NUMBA:
+        carve(buf, cols, sr * cols + sc, draws, DIRS_ARR)
+    else:
+        _carve_py(buf, cols, sr * cols + sc, draws)
+    walls = np.frombuffer(buf, dtype=np.uint8).reshape(rows, cols)  # zero-copy 2D view
 
     return Maze(rows=rows, cols=cols, walls=walls, start=start, goal=goal)
 
 
 def has_wall(maze: Maze, r: int, c: int, direction_bit: int) -> bool:
-    return (maze.walls[r][c] & direction_bit) != 0
\ No newline at end of file
+    return (maze.walls[r, c] & direction_bit) != 0
\ No newline at end of file
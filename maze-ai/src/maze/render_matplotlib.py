@@ -4,9 +4,13 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 from typing import Iterable, List, Optional, Set, Tuple
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.colors import to_rgb
 from matplotlib.patches import Patch
 
 import matplotlib.pyplot as plt
+import numpy as np
+from PIL import Image
 
 from .generator import Maze, N, E, S, W
 
@@ -27,25 +31,44 @@ def _ensure_dir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def save_maze_png(
-    maze: Maze,
-    out_path: str,
-    visited: Optional[Iterable[Coord]] = None,
-    path: Optional[Iterable[Coord]] = None,
-    title: Optional[str] = None,
-    style: SaveStyle = SaveStyle(),
-    dpi: int = 200,
-) -> None:
+# (bit, x1, y1, x2, y2) wall segment offsets from a cell's lower-left corner
+_WALL_OFFSETS = (
+    (N, 0, 1, 1, 1),
+    (E, 1, 0, 1, 1),
+    (S, 0, 0, 1, 0),
+    (W, 0, 0, 0, 1),
+)
+
+
+def _wall_segments(maze: Maze) -> np.ndarray:
+    """All wall segments as an (M, 2, 2) array of endpoints, for one LineCollection."""
+    walls = np.asarray(maze.walls)
+    segs = []
+    for bit, dx1, dy1, dx2, dy2 in _WALL_OFFSETS:
+        r, c = np.nonzero(walls & bit)
+        x, y = c, maze.rows - 1 - r
+        segs.append(np.stack([x + dx1, y + dy1, x + dx2, y + dy2], axis=1))
+    return np.concatenate(segs).reshape(-1, 2, 2)
+
+
+def _cell_polys(cells: Iterable[Coord], rows: int) -> np.ndarray:
+    """Unit squares for the given cells as an (M, 4, 2) array, for one PolyCollection."""
+    rc = np.array(list(cells), dtype=float).reshape(-1, 2)
+    x, y = rc[:, 1], rows - 1 - rc[:, 0]
+    return np.stack([
+        np.stack([x, y], axis=1),
+        np.stack([x + 1, y], axis=1),
+        np.stack([x + 1, y + 1], axis=1),
+        np.stack([x, y + 1], axis=1),
+    ], axis=1)
+
+
+def _maze_figure(maze: Maze, style: SaveStyle, title: Optional[str]):
     """
-    Saves a single PNG showing:
-      - maze walls
-      - visited nodes (optional)
-      - final path (optional)
-      - start/goal markers
+    Build a figure with walls, start/goal and legend drawn.
+    Returns (fig, ax, visited_coll, path_coll); the two collections start
+    empty and are filled by the caller via set_verts().
     """
-    visited_set: Set[Coord] = set(visited) if visited is not None else set()
-    path_set: Set[Coord] = set(path) if path is not None else set()
-
     rows, cols = maze.rows, maze.cols
 
     fig_w = max(4, cols / 6)
@@ -54,38 +77,18 @@ def save_maze_png(
     fig, ax = plt.subplots(figsize=(fig_w, fig_h))
     ax.set_facecolor(style.bg_color)
 
-    # Draw visited and path as filled squares
-    def fill_cell(r: int, c: int, color: str, alpha: float = 1.0):
-        ax.add_patch(plt.Rectangle((c, rows - 1 - r), 1, 1, facecolor=color, edgecolor="none", alpha=alpha))
-
-    for (r, c) in visited_set:
-        if (r, c) != maze.start and (r, c) != maze.goal:
-            fill_cell(r, c, style.visited_color, alpha=0.8)
-
-    for (r, c) in path_set:
-        if (r, c) != maze.start and (r, c) != maze.goal:
-            fill_cell(r, c, style.path_color, alpha=0.95)
+    # Visited and path as filled squares (one collection per color, path on top)
+    visited_coll = PolyCollection([], facecolors=style.visited_color, edgecolors="none", alpha=0.8)
+    path_coll = PolyCollection([], facecolors=style.path_color, edgecolors="none", alpha=0.95)
+    ax.add_collection(visited_coll)
+    ax.add_collection(path_coll)
 
     # Start/Goal
-    sr, sc = maze.start
-    gr, gc = maze.goal
-    fill_cell(sr, sc, style.start_color, alpha=1.0)
-    fill_cell(gr, gc, style.goal_color, alpha=1.0)
+    for s, color in ((maze.start, style.start_color), (maze.goal, style.goal_color)):
+        ax.add_collection(PolyCollection(_cell_polys([s], rows), facecolors=color, edgecolors="none"))
 
     # Draw walls
-    for r in range(rows):
-        for c in range(cols):
-            x1, y1 = c, rows - 1 - r
-            x2, y2 = c + 1, rows - r
-            mask = maze.walls[r][c]
-            if mask & N:
-                ax.plot([x1, x2], [y2, y2], color=style.wall_color, linewidth=1.5)
-            if mask & E:
-                ax.plot([x2, x2], [y1, y2], color=style.wall_color, linewidth=1.5)
-            if mask & S:
-                ax.plot([x1, x2], [y1, y1], color=style.wall_color, linewidth=1.5)
-            if mask & W:
-                ax.plot([x1, x1], [y1, y2], color=style.wall_color, linewidth=1.5)
+    ax.add_collection(LineCollection(_wall_segments(maze), colors=style.wall_color, linewidths=1.5))
 
     ax.set_xlim(0, cols)
     ax.set_ylim(0, rows)
@@ -95,8 +98,6 @@ def save_maze_png(
     if title:
         ax.set_title(title)
 
-    _ensure_dir(os.path.dirname(out_path))
-
     legend_elements = [
         Patch(facecolor=style.start_color, label="Start"),
         Patch(facecolor=style.goal_color, label="Goal"),
@@ -110,11 +111,109 @@ def save_maze_png(
         fontsize=8,
         frameon=True
     )
-    
+    return fig, ax, visited_coll, path_coll
+
+
+def save_maze_png(
+    maze: Maze,
+    out_path: str,
+    visited: Optional[Iterable[Coord]] = None,
+    path: Optional[Iterable[Coord]] = None,
+    title: Optional[str] = None,
+    style: SaveStyle = SaveStyle(),
+    dpi: int = 200,
+) -> None:
+    """
+    Saves a single PNG showing:
+      - maze walls
+      - visited nodes (optional)
+      - final path (optional)
+      - start/goal markers
+    """
+    visited_set: Set[Coord] = set(visited) if visited is not None else set()
+    path_set: Set[Coord] = set(path) if path is not None else set()
+
+    fig, _, visited_coll, path_coll = _maze_figure(maze, style, title)
+
+    endpoints = (maze.start, maze.goal)
+    visited_coll.set_verts(_cell_polys((s for s in visited_set if s not in endpoints), maze.rows))
+    path_coll.set_verts(_cell_polys((s for s in path_set if s not in endpoints), maze.rows))
+
+    _ensure_dir(os.path.dirname(out_path))
     fig.savefig(out_path, dpi=dpi, bbox_inches="tight")
     plt.close(fig)
 
 
+# ---------------------------
+# Direct raster rendering (no matplotlib figure), used for progress frames
+# ---------------------------
+def _rgb(color: str, alpha: float = 1.0, bg: str = "white") -> np.ndarray:
+    """Color as uint8 RGB, alpha-blended over bg."""
+    mixed = alpha * np.array(to_rgb(color)) + (1.0 - alpha) * np.array(to_rgb(bg))
+    return np.round(mixed * 255).astype(np.uint8)
+
+
+def _wall_pixels(maze: Maze, cell_px: int) -> np.ndarray:
+    """
+    Boolean (rows*cell_px+1, cols*cell_px+1) mask of 1-px wall lines.
+    Cell (r, c) spans pixels [r*cell_px, (r+1)*cell_px] in each axis, borders included.
+    """
+    walls = np.asarray(maze.walls)
+    cp = cell_px
+    mask = np.zeros((maze.rows * cp + 1, maze.cols * cp + 1), dtype=bool)
+
+    # horizontal lines (N/S), each cell's wall covers cp+1 pixels
+    for bit, ys in ((N, slice(0, -1, cp)), (S, slice(cp, None, cp))):
+        line = np.repeat((walls & bit) != 0, cp, axis=1)
+        mask[ys, :-1] |= line
+        mask[ys, 1:] |= line
+    # vertical lines (W/E)
+    for bit, xs in ((W, slice(0, -1, cp)), (E, slice(cp, None, cp))):
+        line = np.repeat((walls & bit) != 0, cp, axis=0)
+        mask[:-1, xs] |= line
+        mask[1:, xs] |= line
+    return mask
+
+
+def _paint_cells(img: np.ndarray, free_px: np.ndarray, cells: Iterable[Coord], rgb: np.ndarray, cell_px: int) -> None:
+    """Fill each cell's square in place, leaving wall pixels untouched."""
+    cp = cell_px
+    for r, c in cells:
+        ys, xs = slice(r * cp, (r + 1) * cp), slice(c * cp, (c + 1) * cp)
+        img[ys, xs][free_px[ys, xs]] = rgb
+
+
+def _render_direct(
+    maze: Maze,
+    visited: Optional[Iterable[Coord]] = None,
+    path: Optional[Iterable[Coord]] = None,
+    cell_px: int = 8,
+    style: SaveStyle = SaveStyle(),
+) -> np.ndarray:
+    """Render the maze (+ visited/path overlays) straight into an RGB uint8 array."""
+    wall_px = _wall_pixels(maze, cell_px)
+    free_px = ~wall_px
+
+    img = np.empty(wall_px.shape + (3,), dtype=np.uint8)
+    img[...] = _rgb(style.bg_color)
+    img[wall_px] = _rgb(style.wall_color)
+
+    endpoints = (maze.start, maze.goal)
+    if visited is not None:
+        cells = (s for s in set(visited) if s not in endpoints)
+        _paint_cells(img, free_px, cells, _rgb(style.visited_color, 0.8, style.bg_color), cell_px)
+    if path is not None:
+        cells = (s for s in set(path) if s not in endpoints)
+        _paint_cells(img, free_px, cells, _rgb(style.path_color, 0.95, style.bg_color), cell_px)
+    _paint_cells(img, free_px, [maze.start], _rgb(style.start_color), cell_px)
+    _paint_cells(img, free_px, [maze.goal], _rgb(style.goal_color), cell_px)
+    return img
+
+
+def _save_png(img: np.ndarray, out_path: str) -> None:
+    Image.fromarray(img).save(out_path, optimize=False)
+
+
 def save_progress_frames(
     maze: Maze,
     frames_dir: str,
@@ -126,12 +225,18 @@ def save_progress_frames(
     seed: int,
     every: int = 25,
     max_frames: int = 200,
-    dpi: int = 160,
+    cell_px: int = 8,
+    style: SaveStyle = SaveStyle(),
 ) -> None:
     """
     Saves a sequence of PNG frames as the solver explores.
     - every: save a frame every N expansions
     - max_frames: cap to avoid exploding file count
+    - cell_px: size of one maze cell in pixels
+
+    Frames are painted directly into a NumPy buffer (no matplotlib figure, so
+    no title/legend): the walls are rasterized once and each frame only paints
+    the cells visited since the previous one.
     """
     _ensure_dir(frames_dir)
 
@@ -145,31 +250,29 @@ def save_progress_frames(
         stride = max(1, len(step_indices) // max_frames)
         step_indices = step_indices[::stride]
 
+    img = _render_direct(maze, cell_px=cell_px, style=style)
+    free_px = ~_wall_pixels(maze, cell_px)
+    visited_rgb = _rgb(style.visited_color, 0.8, style.bg_color)
+    endpoints = (maze.start, maze.goal)
+
+    done = 0
     for idx, i in enumerate(step_indices):
-        visited = visited_order[: i + 1]
+        # during search, show exploration only
+        new_cells = (s for s in visited_order[done: i + 1] if s not in endpoints)
+        _paint_cells(img, free_px, new_cells, visited_rgb, cell_px)
+        done = i + 1
         out = os.path.join(
             frames_dir,
             f"{rows}x{cols}_seed{seed}_{algo}_frame{idx:04d}.png",
         )
-        save_maze_png(
-            maze=maze,
-            out_path=out,
-            visited=visited,
-            path=None,  # during search, show exploration only
-            title=f"{algo} | explored {i+1}/{total}",
-            dpi=dpi,
-        )
+        _save_png(img, out)
 
     # also save a final "solution overlay" frame
     out_final = os.path.join(
         frames_dir,
         f"{rows}x{cols}_seed{seed}_{algo}_FINAL.png",
     )
-    save_maze_png(
-        maze=maze,
-        out_path=out_final,
-        visited=visited_order,
-        path=path,
-        title=f"{algo} | FINAL",
-        dpi=dpi,
-    )
\ No newline at end of file
+    _paint_cells(img, free_px, (s for s in visited_order[done:] if s not in endpoints), visited_rgb, cell_px)
+    path_cells = (s for s in set(path) if s not in endpoints)
+    _paint_cells(img, free_px, path_cells, _rgb(style.path_color, 0.95, style.bg_color), cell_px)
+    _save_png(img, out_final)
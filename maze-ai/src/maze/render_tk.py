@@ -59,7 +59,7 @@ class MazeTkRenderer:
         for r in range(self.maze.rows):
             for c in range(self.maze.cols):
                 x1, y1, x2, y2 = self._cell_bbox(r, c)
-                mask = self.maze.walls[r][c]
+                mask = self.maze.walls[r, c]
 
                 if mask & N:
                     self.canvas.create_line(x1, y1, x2, y1, width=2)
@@ -0,0 +1,279 @@
+# src/solvers/_numba_kernels.py
+"""
+Compiled inner loops shared by the solvers: BFS/DFS/A* over
+MazeEnv.neighbor_table and the value-iteration sweep over
+MazeEnv.build_model() tables.
+
+Each solver calls into here only when HAVE_NUMBA is set and otherwise runs
+its own interpreted loop. With Numba, the search kernels are compiled (or
+loaded from the on-disk cache) once at import by running them on a 2x2 maze
+with the same argument types the solvers pass, so compilation never lands
+inside a timed search. The parallel vi_sweep compiles on first use instead;
+main() triggers that untimed via value_iteration.warm_value_iteration.
+"""
+from __future__ import annotations
+import math
+
+import numpy as np
+
+from utils.jit import HAVE_NUMBA, njit, prange
+
+
+@njit(cache=True, parallel=True)
+def vi_sweep(V: np.ndarray, P_next: np.ndarray, P_prob: np.ndarray, R: np.ndarray, gamma: float) -> np.ndarray:
+    """One synchronous Bellman sweep, fused per state (no (S, A, K) temporaries)."""
+    n_states, n_actions, n_outcomes = P_next.shape
+    V_new = np.empty(n_states, dtype=np.float64)
+    for s in prange(n_states):
+        best = -np.inf
+        for a in range(n_actions):
+            q = 0.0
+            for k in range(n_outcomes):
+                q += P_prob[s, a, k] * (R[s, a, k] + gamma * V[P_next[s, a, k]])
+            if q > best:
+                best = q
+        V_new[s] = best
+    return V_new
+
+
+@njit(cache=True)
+def bfs_core(nbrs: np.ndarray, start_i: int, goal_i: int):
+    """
+    BFS over flat indices. nbrs is MazeEnv.neighbor_table ((n, 4) neighbor
+    indices in N, E, S, W order, -1 = none). Returns (parents, expansion
+    order, solved, unique visited, generated, frontier max, total, samples).
+    """
+    n = nbrs.shape[0]
+
+    parents = np.full(n, -1, dtype=np.int32)
+    visited = np.zeros(n, dtype=np.bool_)
+    queue = np.empty(n, dtype=np.int32)  # every state is enqueued at most once
+    order = np.empty(n, dtype=np.int32)
+
+    queue[0] = start_i
+    visited[start_i] = True
+    head, tail = 0, 1
+    n_visited, n_order, generated = 1, 0, 0
+    f_max, f_total, f_samples = 1, 1, 1
+    solved = False
+
+    while head < tail:
+        i = queue[head]
+        head += 1
+        order[n_order] = i
+        n_order += 1
+
+        if i == goal_i:
+            solved = True
+            break
+
+        for d in range(4):
+            j = nbrs[i, d]
+            if j >= 0:
+                generated += 1
+                if visited[j]:
+                    continue
+                visited[j] = True
+                n_visited += 1
+                parents[j] = i
+                queue[tail] = j
+                tail += 1
+
+        size = tail - head
+        f_max = max(f_max, size)
+        f_total += size
+        f_samples += 1
+
+    return parents, order[:n_order], solved, n_visited, generated, f_max, f_total, f_samples
+
+
+@njit(cache=True)
+def dfs_core(nbrs: np.ndarray, start_i: int, goal_i: int):
+    """
+    DFS over flat indices (neighbors pushed W, S, E, N so N is expanded
+    first). Same inputs/outputs as bfs_core.
+    """
+    n = nbrs.shape[0]
+
+    parents = np.full(n, -1, dtype=np.int32)
+    visited = np.zeros(n, dtype=np.bool_)
+    stack = np.empty(n, dtype=np.int32)  # every state is pushed at most once
+    order = np.empty(n, dtype=np.int32)
+
+    stack[0] = start_i
+    visited[start_i] = True
+    top = 1
+    n_visited, n_order, generated = 1, 0, 0
+    f_max, f_total, f_samples = 1, 1, 1
+    solved = False
+
+    while top > 0:
+        top -= 1
+        i = stack[top]
+        order[n_order] = i
+        n_order += 1
+
+        if i == goal_i:
+            solved = True
+            break
+
+        for d in range(3, -1, -1):
+            j = nbrs[i, d]
+            if j >= 0:
+                generated += 1
+                if visited[j]:
+                    continue
+                visited[j] = True
+                n_visited += 1
+                parents[j] = i
+                stack[top] = j
+                top += 1
+
+        f_max = max(f_max, top)
+        f_total += top
+        f_samples += 1
+
+    return parents, order[:n_order], solved, n_visited, generated, f_max, f_total, f_samples
+
+
+@njit(cache=True)
+def _h_idx(i: int, goal_r: int, goal_c: int, cols: int, kind: int) -> float:
+    dr = abs(i // cols - goal_r)
+    dc = abs(i % cols - goal_c)
+    if kind == 0:
+        return float(dr + dc)
+    return math.sqrt(dr * dr + dc * dc)
+
+
+@njit(cache=True)
+def _sift_up(hf, ht, hi, pos, k, f, tie, item):
+    """Place (f, tie, item) at heap slot k or above; hf/ht/hi hold the entries, pos[item] their slots."""
+    while k > 0:
+        p = (k - 1) >> 1
+        if hf[p] < f or (hf[p] == f and ht[p] < tie):
+            break
+        hf[k], ht[k], hi[k] = hf[p], ht[p], hi[p]
+        pos[hi[k]] = k
+        k = p
+    hf[k], ht[k], hi[k] = f, tie, item
+    pos[item] = k
+
+
+@njit(cache=True)
+def _heap_pop(hf, ht, hi, pos, size):
+    """Pop the smallest (f, tie) entry; returns (item, new size)."""
+    i0 = hi[0]
+    pos[i0] = -1
+    size -= 1
+    if size == 0:
+        return i0, size
+    f, tie, item = hf[size], ht[size], hi[size]
+    k = 0
+    while True:
+        c = 2 * k + 1
+        if c >= size:
+            break
+        if c + 1 < size and (hf[c + 1] < hf[c] or (hf[c + 1] == hf[c] and ht[c + 1] < ht[c])):
+            c += 1
+        if f < hf[c] or (f == hf[c] and tie < ht[c]):
+            break
+        hf[k], ht[k], hi[k] = hf[c], ht[c], hi[c]
+        pos[hi[k]] = k
+        k = c
+    hf[k], ht[k], hi[k] = f, tie, item
+    pos[item] = k
+    return i0, size
+
+
+@njit(cache=True)
+def astar_core(nbrs: np.ndarray, cols: int, start_i: int, goal_i: int, kind: int):
+    """
+    A* over flat indices with unit step cost (MazeEnv.cost). kind indexes
+    astar._HEURISTICS. Mirrors the interpreted loop including PriorityQueue's
+    (priority, insertion order) ties and in-place decrease-key.
+    Returns (parents, expansion order, solved, unique seen, generated,
+    repeated updates, heuristic evaluations, frontier max, total, samples).
+    """
+    n = nbrs.shape[0]
+    goal_r, goal_c = goal_i // cols, goal_i % cols
+
+    g = np.full(n, np.inf)
+    parents = np.full(n, -1, dtype=np.int32)
+    closed = np.zeros(n, dtype=np.bool_)
+    order = np.empty(n, dtype=np.int32)
+
+    # indexed heap: one slot per queued state, improved states move in place
+    hf = np.empty(n, dtype=np.float64)
+    ht = np.empty(n, dtype=np.int64)
+    hi = np.empty(n, dtype=np.int32)
+    pos = np.full(n, -1, dtype=np.int64)
+
+    _sift_up(hf, ht, hi, pos, 0, _h_idx(start_i, goal_r, goal_c, cols, kind), 0, start_i)
+    size = 1
+    g[start_i] = 0.0
+    tie = 1
+    n_seen, n_order, generated, repeated = 1, 0, 0, 0
+    f_max, f_total, f_samples = 1, 1, 1  # frontier = states currently queued
+    solved = False
+
+    while size > 0:
+        i, size = _heap_pop(hf, ht, hi, pos, size)
+        if closed[i]:
+            continue
+        closed[i] = True
+        order[n_order] = i
+        n_order += 1
+
+        if i == goal_i:
+            solved = True
+            break
+
+        for d in range(4):
+            j = nbrs[i, d]
+            if j >= 0:
+                generated += 1
+                tentative = g[i] + 1.0
+                if tentative < g[j]:
+                    if g[j] == np.inf:
+                        n_seen += 1
+                    else:
+                        repeated += 1
+                    g[j] = tentative
+                    parents[j] = i
+                    # h(j) is fixed, so a lower g always means a lower f: every update is pushed
+                    fj = tentative + _h_idx(j, goal_r, goal_c, cols, kind)
+                    k = pos[j]
+                    if k < 0:
+                        k = size
+                        size += 1
+                    _sift_up(hf, ht, hi, pos, k, fj, tie, j)
+                    tie += 1
+
+        f_max = max(f_max, size)
+        f_total += size
+        f_samples += 1
+
+    # one heuristic evaluation per push, start included
+    return (parents, order[:n_order], solved, n_seen, generated, repeated, tie,
+            f_max, f_total, f_samples)
+
+
+def _readonly(a: np.ndarray) -> np.ndarray:
+    a.flags.writeable = False
+    return a
+
+
+def _warm_up() -> None:
+    # fully open 2x2 maze; read-only like MazeEnv's tables, since Numba
+    # specializes on array mutability
+    nbrs = _readonly(np.array([[-1, 1, 2, -1], [-1, -1, 3, 0], [0, 3, -1, -1], [1, -1, -1, 2]], dtype=np.int32))
+    bfs_core(nbrs, 0, 3)
+    dfs_core(nbrs, 0, 3)
+    astar_core(nbrs, 2, 0, 3, 0)
+    # vi_sweep is left to warm_value_iteration: running a parallel kernel
+    # starts Numba's threading layer, and importing must not do that before
+    # run_batch forks its worker pool
+
+
+if HAVE_NUMBA:
+    _warm_up()
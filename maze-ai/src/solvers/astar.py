@@ -1,80 +1,121 @@
 # src/solvers/astar.py
 from __future__ import annotations
 import math
-from typing import Dict, Optional, Set, Tuple
+from typing import Callable, List, Tuple
+
+import numpy as np
 
 from maze.env import MazeEnv
 from analytics.metrics import RunMetrics
+from utils.jit import HAVE_NUMBA
 from utils.priority_queue import PriorityQueue
-from .common import SolveResult, reconstruct_path
+from ._numba_kernels import astar_core
+from .common import SolveResult, search_result
 
 Coord = Tuple[int, int]
 
 
-def _h(a: Coord, b: Coord, kind: str, metrics: RunMetrics) -> float:
-    (r1, c1), (r2, c2) = a, b
-    dr = abs(r1 - r2)
-    dc = abs(c1 - c2)
-    metrics.heuristic_evaluations += 1
+def _make_h(kind: str, goal: Coord) -> Callable[[int, int], float]:
+    """Heuristic to `goal` specialized once per solve: h(r, c) with no dispatch or bookkeeping."""
+    goal_r, goal_c = goal
     if kind == "manhattan":
-        return float(dr + dc)
+        return lambda r, c: float(abs(r - goal_r) + abs(c - goal_c))
     if kind == "euclidean":
-        return math.sqrt(dr * dr + dc * dc)
+        # math.sqrt (not hypot) to match the compiled kernel bit for bit
+        return lambda r, c: math.sqrt((r - goal_r) ** 2 + (c - goal_c) ** 2)
     raise ValueError("heuristic must be 'manhattan' or 'euclidean'")
 
 
+_HEURISTICS = ("manhattan", "euclidean")
+
+
 def solve_astar(env: MazeEnv, metrics: RunMetrics, heuristic: str) -> SolveResult:
+    if HAVE_NUMBA:
+        if heuristic not in _HEURISTICS:
+            raise ValueError("heuristic must be 'manhattan' or 'euclidean'")
+        metrics.heuristic_type = heuristic
+        start_i = env.state_index(env.maze.start)
+        parents, order, solved, n_seen, generated, repeated, h_evals, *frontier = astar_core(
+            env.neighbor_table, env.maze.cols, start_i, env.goal_idx, _HEURISTICS.index(heuristic))
+        metrics.repeated_state_updates += repeated
+        metrics.heuristic_evaluations += h_evals
+        return search_result(env, metrics, start_i, parents, order, solved, n_seen, generated, frontier)
+    return _solve_astar_py(env, metrics, heuristic)
+
+
+def _solve_astar_py(env: MazeEnv, metrics: RunMetrics, heuristic: str) -> SolveResult:
+    """Interpreted A* (used without Numba); same results as _numba_kernels.astar_core."""
+    # states are flat indices r * cols + c; cells come back via env.coords
+    coords = env.coords
     start = env.maze.start
     goal = env.maze.goal
+    start_i = env.state_index(start)
+    goal_i = env.goal_idx
+    neighbors = env.neighbor_indices
 
     metrics.heuristic_type = heuristic
 
-    openpq: PriorityQueue[Coord] = PriorityQueue()
-    openpq.push(start, priority=_h(start, goal, heuristic, metrics))
-
-    g: Dict[Coord, float] = {start: 0.0}
-    parents: Dict[Coord, Optional[Coord]] = {start: None}
-    closed: Set[Coord] = set()
-    visited_order = []
-
-    metrics.record_frontier(len(openpq))
+    h = _make_h(heuristic, goal)
+    openpq = PriorityQueue(len(coords))
+    openpq.push(start_i, priority=h(start[0], start[1]))
+    h_evals = 1
+
+    inf = float("inf")
+    g: List[float] = [inf] * len(coords)
+    g[start_i] = 0.0
+    n_seen = 1  # states with a finite g
+    parents: List[int] = [-1] * len(coords)
+    closed = bytearray(len(coords))
+    order: List[int] = []  # expansion order as flat indices
+
+    # counters stay in locals; metrics are written once after the loop
+    generated = 0
+    repeated = 0
+    f_max = f_total = len(openpq)
+    f_samples = 1
+    solved = False
 
     while True:
         try:
-            s, _ = openpq.pop()
+            i, _ = openpq.pop()
         except IndexError:
             break
 
-        if s in closed:
+        if closed[i]:
             continue
-        closed.add(s)
+        closed[i] = 1
 
-        visited_order.append(s)
-        metrics.states_expanded += 1
+        s = coords[i]
+        order.append(i)
 
-        if s == goal:
-            path = reconstruct_path(parents, start, goal)
-            metrics.unique_states_visited = len(g)
-            metrics.solution_path_length = max(0, len(path) - 1)
-            metrics.solution_cost = float(metrics.solution_path_length)
-            metrics.solved = True
-            return SolveResult(path=path, visited_order=visited_order, parents=parents)
-
-        for nb in env.neighbors(s):
-            metrics.states_generated += 1
-            tentative = g[s] + env.cost(s, nb)
-
-            if nb in g and tentative < g[nb]:
-                metrics.repeated_state_updates += 1
-
-            if nb not in g or tentative < g[nb]:
-                g[nb] = tentative
-                parents[nb] = s
-                f = tentative + _h(nb, goal, heuristic, metrics)
-                openpq.push(nb, priority=f)
-
-        metrics.record_frontier(len(openpq))
+        if i == goal_i:
+            solved = True
+            break
 
-    metrics.unique_states_visited = len(g)
-    metrics.solved = False
-    return SolveResult(path=[], visited_order=visited_order, parents=parents)
\ No newline at end of file
+        g_i = g[i]
+        for j in neighbors(i):
+            generated += 1
+            nb = coords[j]
+            tentative = g_i + env.cost(s, nb)
+
+            old = g[j]
+            if tentative < old:
+                if old == inf:
+                    n_seen += 1
+                else:
+                    repeated += 1
+                g[j] = tentative
+                parents[j] = i
+                openpq.push(j, priority=tentative + h(nb[0], nb[1]))
+                h_evals += 1
+
+        size = len(openpq)
+        if size > f_max:
+            f_max = size
+        f_total += size
+        f_samples += 1
+
+    metrics.repeated_state_updates += repeated
+    metrics.heuristic_evaluations += h_evals
+    return search_result(env, metrics, start_i, parents, np.array(order, dtype=np.int32), solved,
+                         n_seen, generated, (f_max, f_total, f_samples))
@@ -1,7 +1,12 @@
 # src/solvers/common.py
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from maze.env import MazeEnv
+from analytics.metrics import RunMetrics
 
 Coord = Tuple[int, int]
 
@@ -9,8 +14,20 @@ Coord = Tuple[int, int]
 @dataclass
 class SolveResult:
     path: List[Coord]
-    visited_order: List[Coord]          # expansion order (for animation)
-    parents: Dict[Coord, Optional[Coord]]  # for debugging/visualization
+    visited_idx: np.ndarray             # expansion order as flat state indices r * cols + c (int32)
+    cols: int                           # maze width, to unpack visited_idx
+    # for debugging/visualization: a coord dict, or a flat int array over
+    # state indices (-1 = no parent) from the index-based searches
+    parents: Union[Dict[Coord, Optional[Coord]], Sequence[int]]
+    _visited_order: Optional[List[Coord]] = field(default=None, init=False, repr=False)
+
+    @property
+    def visited_order(self) -> List[Coord]:
+        """Expansion order as cells (for animation); unpacked from visited_idx on first use."""
+        if self._visited_order is None:
+            rows, cols = np.divmod(self.visited_idx, self.cols)
+            self._visited_order = list(zip(rows.tolist(), cols.tolist()))
+        return self._visited_order
 
 
 def reconstruct_path(parents: Dict[Coord, Optional[Coord]], start: Coord, goal: Coord) -> List[Coord]:
@@ -20,8 +37,83 @@ def reconstruct_path(parents: Dict[Coord, Optional[Coord]], start: Coord, goal:
     out: List[Coord] = []
     while cur is not None:
         out.append(cur)
-        cur = parents.get(cur)
+        cur = parents.get(cur)  # a missing key ends the walk, so the start check rejects it
+    if out[-1] != start:
+        return []
+    out.reverse()
+    return out
+
+
+def reconstruct_path_idx(parents: Sequence[int], start_i: int, goal_i: int, coords: Sequence[Coord]) -> List[Coord]:
+    """reconstruct_path for a flat parents array (-1 = none); coords maps index -> cell."""
+    # an unreached goal has no parent, so the walk just ends on it instead of start
+    cur = goal_i
+    out: List[int] = []
+    while cur >= 0:
+        out.append(cur)
+        cur = parents[cur]
+    if out[-1] != start_i:
+        return []
     out.reverse()
-    if out and out[0] == start:
-        return out
-    return []
\ No newline at end of file
+    return [coords[i] for i in out]
+
+
+def search_result(env: MazeEnv, metrics: RunMetrics, start_i: int, parents: Sequence[int], order: np.ndarray,
+                  solved: bool, n_visited: int, generated: int, frontier: Tuple[int, int, int]) -> SolveResult:
+    """
+    Fill search metrics once and build the SolveResult from what a BFS/DFS/A*
+    loop (compiled or interpreted) accumulated in locals: flat parents array,
+    expansion order as int32 indices, counters, and (max, total, samples)
+    frontier stats.
+    """
+    metrics.states_expanded += len(order)
+    metrics.states_generated += generated
+    metrics.unique_states_visited = n_visited
+    metrics.record_frontier_stats(*frontier)
+    cols = env.maze.cols
+
+    if not solved:
+        metrics.solved = False
+        return SolveResult(path=[], visited_idx=order, cols=cols, parents=parents)
+
+    # Python ints walk faster than array scalars
+    walk = parents.tolist() if isinstance(parents, np.ndarray) else parents
+    path = reconstruct_path_idx(walk, start_i, env.goal_idx, env.coords)
+    metrics.solution_path_length = max(0, len(path) - 1)
+    metrics.solution_cost = float(metrics.solution_path_length)
+    metrics.solved = True
+    return SolveResult(path=path, visited_idx=order, cols=cols, parents=parents)
+
+
+def follow_policy(env: MazeEnv, P_next: np.ndarray, pi: np.ndarray, max_steps: int) -> List[Coord]:
+    """
+    Roll out the action-index policy pi (indexed by state_index) from start,
+    taking each action's first outcome in the build_model() table
+    (deterministic, or the intended move with slip). Stops at the goal or
+    when a step stays in place.
+    """
+    # next state under pi for every state at once; the walk is then plain int reads
+    next_of_policy = P_next[np.arange(len(pi)), pi, 0].tolist()
+    goal_i = env.goal_idx
+
+    cur = env.state_index(env.maze.start)
+    path = [cur]
+    for _ in range(max_steps):
+        if cur == goal_i:
+            break
+        nxt = next_of_policy[cur]
+        path.append(nxt)
+        if nxt == cur:
+            # stuck bouncing
+            break
+        cur = nxt
+    coords = env.coords
+    return [coords[i] for i in path]
+
+
+def bellman_q(V: np.ndarray, P_next: np.ndarray, P_prob: np.ndarray, R: np.ndarray, gamma: float) -> np.ndarray:
+    """Q[s, a] for every state/action at once, from a MazeEnv.build_model() table."""
+    if P_next.shape[-1] == 1:
+        # deterministic: the single outcome has probability 1, skip the weighted sum
+        return R[..., 0] + gamma * V[P_next[..., 0]]
+    return (P_prob * (R + gamma * V[P_next])).sum(axis=-1)
@@ -1,49 +1,70 @@
 # src/solvers/dfs.py
 from __future__ import annotations
-from typing import Dict, Optional, Set, Tuple, List
+from typing import Tuple, List
+
+import numpy as np
 
 from maze.env import MazeEnv
 from analytics.metrics import RunMetrics
-from .common import SolveResult, reconstruct_path
+from utils.jit import HAVE_NUMBA
+from ._numba_kernels import dfs_core
+from .common import SolveResult, search_result
 
 Coord = Tuple[int, int]
 
 
 def solve_dfs(env: MazeEnv, metrics: RunMetrics) -> SolveResult:
-    start = env.maze.start
-    goal = env.maze.goal
+    if HAVE_NUMBA:
+        start_i = env.state_index(env.maze.start)
+        parents, order, solved, n_visited, generated, *frontier = dfs_core(
+            env.neighbor_table, start_i, env.goal_idx)
+        return search_result(env, metrics, start_i, parents, order, solved, n_visited, generated, frontier)
+    return _solve_dfs_py(env, metrics)
+
+
+def _solve_dfs_py(env: MazeEnv, metrics: RunMetrics) -> SolveResult:
+    """Interpreted DFS (used without Numba); same results as _numba_kernels.dfs_core."""
+    # states are flat indices r * cols + c; cells come back via env.coords
+    coords = env.coords
+    start_i = env.state_index(env.maze.start)
+    goal_i = env.goal_idx
+    neighbors_rev = env.neighbor_indices_reversed
 
-    stack: List[Coord] = [start]
-    visited: Set[Coord] = {start}
-    parents: Dict[Coord, Optional[Coord]] = {start: None}
-    visited_order: List[Coord] = []
+    stack: List[int] = [start_i]
+    visited = bytearray(len(coords))
+    visited[start_i] = 1
+    n_visited = 1
+    parents: List[int] = [-1] * len(coords)
+    order: List[int] = []  # expansion order as flat indices
 
-    metrics.record_frontier(len(stack))
+    # counters stay in locals; metrics are written once by search_result
+    generated = 0
+    f_max, f_total, f_samples = 1, 1, 1
+    solved = False
 
     while stack:
-        s = stack.pop()
-        visited_order.append(s)
-        metrics.states_expanded += 1
-
-        if s == goal:
-            path = reconstruct_path(parents, start, goal)
-            metrics.unique_states_visited = len(visited)
-            metrics.solution_path_length = max(0, len(path) - 1)
-            metrics.solution_cost = float(metrics.solution_path_length)
-            metrics.solved = True
-            return SolveResult(path=path, visited_order=visited_order, parents=parents)
-
-        nbs = env.neighbors(s)
-        for nb in reversed(nbs):
-            metrics.states_generated += 1
-            if nb in visited:
+        i = stack.pop()
+        order.append(i)
+
+        if i == goal_i:
+            solved = True
+            break
+
+        # pushed back to front so the first neighbor is expanded first
+        for j in neighbors_rev(i):
+            generated += 1
+            if visited[j]:
                 continue
-            visited.add(nb)
-            parents[nb] = s
-            stack.append(nb)
+            visited[j] = 1
+            n_visited += 1
+            parents[j] = i
+            stack.append(j)
 
-        metrics.record_frontier(len(stack))
+        size = len(stack)
+        if size > f_max:
+            f_max = size
+        f_total += size
+        f_samples += 1
 
-    metrics.unique_states_visited = len(visited)
-    metrics.solved = False
-    return SolveResult(path=[], visited_order=visited_order, parents=parents)
\ No newline at end of file
+    return search_result(env, metrics, start_i, parents, np.array(order, dtype=np.int32), solved,
+                         n_visited, generated, (f_max, f_total, f_samples))
@@ -1,64 +1,99 @@
 # src/solvers/policy_iteration.py
 from __future__ import annotations
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
+
+import numpy as np
 
 from maze.env import MazeEnv
 from analytics.metrics import RunMetrics
-from .common import SolveResult
+from .common import SolveResult, bellman_q, follow_policy
+
+try:  # scipy is optional; only evaluation="linear" needs it
+    from scipy.sparse import csr_matrix, identity
+    from scipy.sparse.linalg import spsolve
+    HAVE_SCIPY = True
+except ImportError:
+    HAVE_SCIPY = False
 
 Coord = Tuple[int, int]
 
+_TIE_TOL = 1e-9  # relative Q margin an action must win by to replace the current one
+
+
+def _solve_linear(env: MazeEnv, Pn: np.ndarray, Pp: np.ndarray, Rr: np.ndarray) -> Tuple[np.ndarray, float, int]:
+    """
+    Exact V for a fixed policy: solve (I - gamma * T_pi) V = r_pi with one
+    sparse LU. Returns the remaining Bellman residual as delta and 1 as the
+    sweep count.
+    """
+    n_states, n_outcomes = Pn.shape
+    rows = np.repeat(np.arange(n_states), n_outcomes)
+    # duplicate (row, col) entries (slip outcomes landing on the same cell) are summed
+    T_pi = csr_matrix((Pp.ravel(), (rows, Pn.ravel())), shape=(n_states, n_states))
+    r_pi = (Pp * Rr).sum(axis=1)
+
+    V = spsolve((identity(n_states, format="csr") - env.gamma * T_pi).tocsc(), r_pi)
+    delta = float(np.abs((Pp * (Rr + env.gamma * V[Pn])).sum(axis=1) - V).max())
+    return V, delta, 1
+
+
+_EVALUATIONS = ("sweeps", "linear")
+
+
+def _check_evaluation(env: MazeEnv, evaluation: str, k_eval: Optional[int]) -> None:
+    if evaluation not in _EVALUATIONS:
+        raise ValueError("evaluation must be 'sweeps' or 'linear'")
+    if k_eval is not None and k_eval < 1:
+        raise ValueError("k_eval must be a positive sweep count or None")
+    if evaluation == "linear":
+        # an exact solve has no sweeps to truncate
+        if k_eval is not None:
+            raise ValueError("evaluation='linear' is exact; pass k_eval=None")
+        if not HAVE_SCIPY:
+            raise ImportError("evaluation='linear' requires scipy")
+        # gamma < 1 keeps I - gamma * T_pi nonsingular for any policy
+        if env.gamma >= 1.0:
+            raise ValueError("evaluation='linear' requires gamma < 1")
+
+
+def _policy_evaluation(env: MazeEnv, model: Tuple[np.ndarray, np.ndarray, np.ndarray], pi: np.ndarray,
+                       theta: float, max_eval_iters: int, V: np.ndarray,
+                       linear: bool = False) -> Tuple[np.ndarray, float, int]:
+    """
+    V for policy pi: a direct solve if linear, else Jacobi sweeps
+    warm-started from V until delta < theta or max_eval_iters sweeps.
+    """
+    P_next, P_prob, R = model
+    # restrict the model to the policy's action in every state: (S, K)
+    rows = np.arange(P_next.shape[0])
+    Pn, Pp, Rr = P_next[rows, pi], P_prob[rows, pi], R[rows, pi]
+
+    if linear:
+        return _solve_linear(env, Pn, Pp, Rr)
 
-def _policy_evaluation(env: MazeEnv, policy: Dict[Coord, str], theta: float, max_eval_iters: int) -> Tuple[Dict[Coord, float], float, int]:
-    V: Dict[Coord, float] = {s: 0.0 for s in env.states()}
     delta = 0.0
     it = 0
     for it in range(1, max_eval_iters + 1):
-        delta = 0.0
-        for s in env.states():
-            if env.is_goal(s):
-                continue
-            v_old = V[s]
-            a = policy[s]
-            V[s] = env.expected_return(V, s, a)
-            delta = max(delta, abs(v_old - V[s]))
+        V_new = (Pp * (Rr + env.gamma * V[Pn])).sum(axis=1)
+        delta = float(np.abs(V_new - V).max())
+        V = V_new
         if delta < theta:
             break
     return V, float(delta), it
 
 
-def _policy_improvement(env: MazeEnv, V: Dict[Coord, float], policy: Dict[Coord, str]) -> bool:
-    stable = True
-    for s in env.states():
-        if env.is_goal(s):
-            continue
-        old = policy[s]
-        best_a = old
-        best_q = float("-inf")
-        for a in env.ACTIONS:
-            q = env.expected_return(V, s, a)
-            if q > best_q:
-                best_q = q
-                best_a = a
-        policy[s] = best_a
-        if best_a != old:
-            stable = False
-    return stable
-
-
-def _follow_policy(env: MazeEnv, policy: Dict[Coord, str], max_steps: int) -> List[Coord]:
-    s = env.maze.start
-    path = [s]
-    for _ in range(max_steps):
-        if env.is_goal(s):
-            break
-        a = policy.get(s, "U")
-        s2 = env.transitions(s, a)[0][0]
-        path.append(s2)
-        if s2 == s:
-            break
-        s = s2
-    return path
+def _policy_improvement(env: MazeEnv, model: Tuple[np.ndarray, np.ndarray, np.ndarray], V: np.ndarray,
+                        pi: np.ndarray, non_goal: np.ndarray) -> bool:
+    Q = bellman_q(V, *model, env.gamma)
+    rows = np.arange(Q.shape[0])
+    # argmax picks the first best action in ACTIONS order, like a strict ">" scan
+    best = Q.argmax(axis=1)
+    q_cur = Q[rows, pi]
+    # switch only on a real improvement: tied actions differ by rounding noise
+    # after an exact solve, and flipping between them would never stabilize
+    change = non_goal & (Q[rows, best] > q_cur + _TIE_TOL * (1.0 + np.abs(q_cur)))
+    pi[change] = best[change]
+    return not bool(change.any())
 
 
 def solve_policy_iteration(
@@ -66,50 +101,81 @@ def solve_policy_iteration(
     metrics: RunMetrics,
     theta: float = 1e-6,
     max_policy_iters: int = 10_000,
-    max_eval_iters: int = 50_000
+    max_eval_iters: int = 50_000,
+    k_eval: Optional[int] = 20,
+    evaluation: str = "sweeps",
+    record_every: Optional[int] = None
 ) -> SolveResult:
     """
     Policy Iteration:
       - initialize arbitrary policy
-      - policy evaluation (iterative)
+      - policy evaluation (iterative sweeps, or evaluation="linear" for an
+        exact sparse solve per iteration; needs scipy and is usually slower)
       - policy improvement
+
+    When evaluating by sweeps, this is modified policy iteration: each
+    evaluation runs only k_eval sweeps from the previous V, and once the
+    policy stops changing it is confirmed with a full evaluation (to theta
+    or max_eval_iters) before stopping. k_eval=None always evaluates fully,
+    and is required with evaluation="linear".
+
+    Policies are arrays of action indices over flat state indices, and both
+    steps run vectorized over the tables from env.build_model().
+    visited_order holds one pass over all states for the first iteration and
+    every `record_every` iterations after it (default: max_policy_iters // 100).
     """
+    _check_evaluation(env, evaluation, k_eval)
+    if record_every is None:
+        record_every = max(1, max_policy_iters // 100)
+    linear = evaluation == "linear"
+
     metrics.discount_factor = env.gamma
     metrics.convergence_threshold = theta
     metrics.step_reward = env.step_reward
     metrics.goal_reward = env.goal_reward
     metrics.wall_penalty = env.wall_reward
 
-    policy: Dict[Coord, str] = {}
-    for s in env.states():
-        policy[s] = "R"  # simple initial policy
+    model = env.build_model()
+    states = list(env.states())
+    non_goal = np.array([not env.is_goal(s) for s in states])
 
-    visited_order: List[Coord] = []  # for optional GUI "activity"
+    pi = np.full(len(states), env.ACTIONS.index("R"), dtype=np.int64)  # simple initial policy
+
+    # for optional GUI "activity": one pass over all states per recorded PI iteration
+    all_idx = np.arange(len(states), dtype=np.int32)
+    pi_iters = 0
 
     final_delta = 0.0
     total_eval_sweeps = 0
+    V = np.zeros(len(states), dtype=np.float64)
+    truncated = k_eval is not None
+    confirming = False  # a truncated evaluation found pi stable; re-check with a full one
 
     for pi_it in range(1, max_policy_iters + 1):
-        V, delta, eval_iters = _policy_evaluation(env, policy, theta=theta, max_eval_iters=max_eval_iters)
+        full = not truncated or confirming
+        V, delta, eval_iters = _policy_evaluation(env, model, pi, theta=theta, V=V,
+                                                  max_eval_iters=max_eval_iters if full else k_eval,
+                                                  linear=linear)
         final_delta = delta
         total_eval_sweeps += eval_iters
+        pi_iters = pi_it
 
-        # record a sweep worth of states for GUI (lightweight)
-        for s in env.states():
-            visited_order.append(s)
-
-        stable = _policy_improvement(env, V, policy)
-        if stable:
+        stable = _policy_improvement(env, model, V, pi, non_goal)
+        confirming = stable and not full
+        if stable and full:
             metrics.policy_iteration_steps = pi_it
             metrics.final_convergence_error = float(final_delta)
             metrics.policy_evaluation_steps = total_eval_sweeps
             break
 
-    path = _follow_policy(env, policy, max_steps=env.maze.rows * env.maze.cols * 4)
+    path = follow_policy(env, model[0], pi, max_steps=env.maze.rows * env.maze.cols * 4)
     solved = (len(path) > 0 and path[-1] == env.maze.goal)
 
     metrics.solved = solved
     metrics.solution_path_length = max(0, len(path) - 1) if solved else 0
     metrics.solution_cost = float(metrics.solution_path_length)
 
-    return SolveResult(path=path if solved else [], visited_order=visited_order, parents={})
\ No newline at end of file
+    # iterations 1, 1 + record_every, ... were recorded
+    n_recorded = (pi_iters - 1) // record_every + 1 if pi_iters else 0
+    return SolveResult(path=path if solved else [], visited_idx=np.tile(all_idx, n_recorded),
+                       cols=env.maze.cols, parents={})
\ No newline at end of file
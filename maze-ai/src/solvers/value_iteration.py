@@ -1,85 +1,83 @@
 # src/solvers/value_iteration.py
 from __future__ import annotations
 import time
-from typing import Dict, List, Tuple
+from typing import Optional, Tuple
+
+import numpy as np
 
 from maze.env import MazeEnv
 from analytics.metrics import RunMetrics
-from .common import SolveResult
+from utils.jit import HAVE_NUMBA
+from ._numba_kernels import vi_sweep
+from .common import SolveResult, bellman_q, follow_policy
 
 Coord = Tuple[int, int]
 
 
-def _derive_policy(env: MazeEnv, V: Dict[Coord, float]) -> Dict[Coord, str]:
-    policy: Dict[Coord, str] = {}
-    for s in env.states():
-        if env.is_goal(s):
-            policy[s] = "U"  # arbitrary; terminal
-            continue
-        best_a = None
-        best_q = float("-inf")
-        for a in env.ACTIONS:
-            q = env.expected_return(V, s, a)
-            if q > best_q:
-                best_q = q
-                best_a = a
-        policy[s] = best_a if best_a is not None else "U"
-    return policy
-
-
-def _follow_policy(env: MazeEnv, policy: Dict[Coord, str], max_steps: int) -> List[Coord]:
-    s = env.maze.start
-    path = [s]
-    for _ in range(max_steps):
-        if env.is_goal(s):
-            break
-        a = policy.get(s, "U")
-        s2 = env.transitions(s, a)[0][0]  # deterministic or most-probable first
-        path.append(s2)
-        if s2 == s:
-            # stuck bouncing
-            break
-        s = s2
-    return path
+def _vi_sweep(V: np.ndarray, P_next: np.ndarray, P_prob: np.ndarray, R: np.ndarray, gamma: float) -> np.ndarray:
+    if HAVE_NUMBA:
+        return vi_sweep(V, P_next, P_prob, R, gamma)
+    # a scalar loop is slow in plain Python; use the vectorized NumPy backup instead
+    return bellman_q(V, P_next, P_prob, R, gamma).max(axis=1)
+
+
+def warm_value_iteration(env: MazeEnv) -> None:
+    """
+    Run one sweep on env's MDP tables, outside any timed region, so the
+    Numba vi_sweep is compiled (or loaded from cache) before the first solve.
+    """
+    P_next, P_prob, R = env.build_model()
+    _vi_sweep(np.zeros(P_next.shape[0], dtype=np.float64), P_next, P_prob, R, env.gamma)
+
+
+def _derive_policy(env: MazeEnv, Q: np.ndarray) -> np.ndarray:
+    """Greedy action index per state; the goal gets "U" (arbitrary; terminal)."""
+    # argmax picks the first best action in ACTIONS order, like a strict ">" scan
+    pi = Q.argmax(axis=1)
+    pi[env.goal_idx] = env.ACTIONS.index("U")
+    return pi
 
 
-def solve_value_iteration(env: MazeEnv, metrics: RunMetrics, theta: float = 1e-6, max_iters: int = 200_000) -> SolveResult:
+def solve_value_iteration(env: MazeEnv, metrics: RunMetrics, theta: float = 1e-6, max_iters: int = 200_000,
+                          record_every: Optional[int] = None) -> SolveResult:
     """
     Standard Value Iteration for an MDP maze.
     Returns a policy-induced path from start to goal (if it reaches goal).
+
+    Each sweep is a synchronous Bellman backup over all states at once,
+    using the transition/reward tables from env.build_model().
+    visited_order holds one sweep of states for the first sweep and every
+    `record_every` sweeps after it (default: max_iters // 100).
     """
+    if record_every is None:
+        record_every = max(1, max_iters // 100)
+
     metrics.discount_factor = env.gamma
     metrics.convergence_threshold = theta
     metrics.step_reward = env.step_reward
     metrics.goal_reward = env.goal_reward
     metrics.wall_penalty = env.wall_reward
 
-    V: Dict[Coord, float] = {s: 0.0 for s in env.states()}
+    P_next, P_prob, R = env.build_model()
+
+    # the goal is absorbing with reward 0, so its value stays 0 across sweeps
+    V = np.zeros(P_next.shape[0], dtype=np.float64)
 
-    visited_order: List[Coord] = []  # for GUI: we'll show "sweeps" as visits (optional)
+    # for GUI: we'll show "sweeps" as visits (optional); every sweep covers the non-goal states
+    sweep_idx = np.flatnonzero(np.arange(P_next.shape[0]) != env.goal_idx).astype(np.int32)
 
     it = 0
     delta = 0.0
     for it in range(1, max_iters + 1):
-        delta = 0.0
-        for s in env.states():
-            if env.is_goal(s):
-                continue
-            v_old = V[s]
-            best = float("-inf")
-            for a in env.ACTIONS:
-                best = max(best, env.expected_return(V, s, a))
-            V[s] = best
-            delta = max(delta, abs(v_old - V[s]))
-
-            # for a tiny bit of visual activity (not too heavy)
-            visited_order.append(s)
+        V_new = _vi_sweep(V, P_next, P_prob, R, env.gamma)
+        delta = float(np.abs(V_new - V).max())
+        V = V_new
 
         if delta < theta:
             break
 
-    policy = _derive_policy(env, V)
-    path = _follow_policy(env, policy, max_steps=env.maze.rows * env.maze.cols * 4)
+    pi = _derive_policy(env, bellman_q(V, P_next, P_prob, R, env.gamma))
+    path = follow_policy(env, P_next, pi, max_steps=env.maze.rows * env.maze.cols * 4)
 
     solved = (len(path) > 0 and path[-1] == env.maze.goal)
 
@@ -90,4 +88,7 @@ def solve_value_iteration(env: MazeEnv, metrics: RunMetrics, theta: float = 1e-6
     metrics.solution_cost = float(metrics.solution_path_length)
 
     # We’ll store policy in parents as None (GUI doesn’t need parents for MDP)
-    return SolveResult(path=path if solved else [], visited_order=visited_order, parents={})
\ No newline at end of file
+    # sweeps 1, 1 + record_every, ... were recorded
+    n_recorded = (it - 1) // record_every + 1 if it else 0
+    return SolveResult(path=path if solved else [], visited_idx=np.tile(sweep_idx, n_recorded),
+                       cols=env.maze.cols, parents={})
@@ -0,0 +1,27 @@
+# src/utils/jit.py
+"""
+Optional Numba support.
+
+Kernels are written once as plain scalar-loop Python over NumPy arrays and
+decorated with `njit`: with Numba installed they are compiled, without it
+`njit` is a no-op and the same code runs as ordinary Python (slower, same
+results).
+"""
+from __future__ import annotations
+
+try:
+    from numba import njit, prange, set_num_threads
+    HAVE_NUMBA = True
+except ImportError:  # numba is optional
+    HAVE_NUMBA = False
+    prange = range
+
+    def set_num_threads(n: int) -> None:
+        # parallel kernels run serially without Numba
+        pass
+
+    def njit(*args, **kwargs):
+        # supports both @njit and @njit(cache=True, ...)
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
@@ -3,6 +3,13 @@ from __future__ import annotations
 import os
 from dataclasses import dataclass
 
+# filename-safe: "/" and " " -> "_" in one translate() pass
+_SAFE_TABLE = str.maketrans({"/": "_", " ": "_"})
+
+_IMAGES_DIR = os.path.join("outputs", "images")
+_PLOTS_DIR = os.path.join("outputs", "plots")
+_FRAMES_DIR = os.path.join(_IMAGES_DIR, "frames")
+
 
 @dataclass(frozen=True)
 class OutputPaths:
@@ -24,20 +31,20 @@ def image_path(algo: str, rows: int, cols: int, seed: int, extra: str = "") -> s
     """
     Create a consistent image filename for solved maze output.
     """
-    safe_algo = algo.replace("/", "_").replace(" ", "_")
+    safe_algo = algo.translate(_SAFE_TABLE)
     tag = f"{rows}x{cols}_seed{seed}"
     if extra:
-        extra = extra.replace("/", "_").replace(" ", "_")
+        extra = extra.translate(_SAFE_TABLE)
         name = f"{tag}_{safe_algo}_{extra}.png"
     else:
         name = f"{tag}_{safe_algo}.png"
-    return os.path.join("outputs", "images", name)
+    return os.path.join(_IMAGES_DIR, name)
 
 
 def plot_path(name: str) -> str:
-    safe = name.replace("/", "_").replace(" ", "_")
-    return os.path.join("outputs", "plots", f"{safe}.png")
+    safe = name.translate(_SAFE_TABLE)
+    return os.path.join(_PLOTS_DIR, f"{safe}.png")
 
 def frames_dir(algo: str, rows: int, cols: int, seed: int) -> str:
-    safe_algo = algo.replace("/", "_").replace(" ", "_")
-    return os.path.join("outputs", "images", "frames", f"{rows}x{cols}_seed{seed}_{safe_algo}")
\ No newline at end of file
+    safe_algo = algo.translate(_SAFE_TABLE)
+    return os.path.join(_FRAMES_DIR, f"{rows}x{cols}_seed{seed}_{safe_algo}")
\ No newline at end of file
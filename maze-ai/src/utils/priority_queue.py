@@ -1,54 +1,92 @@
 # src/utils/priority_queue.py
 from __future__ import annotations
-import heapq
-from dataclasses import dataclass, field
-from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+from typing import List, Optional, Tuple
 
-T = TypeVar("T")
+_INF = float("inf")
 
 
-@dataclass(order=True)
-class _PQItem(Generic[T]):
-    priority: float
-    tie: int
-    item: T = field(compare=False)
-
-
-class PriorityQueue(Generic[T]):
+class PriorityQueue:
     """
-    Min-priority queue with:
+    Min-priority queue over integer items 0..n-1 (e.g. flat state indices) with:
       - stable tie-breaker
-      - optional decrease-key via pushing new entries and checking best-known priorities
+      - decrease-key: an indexed binary heap, so re-pushing a queued item with
+        a better priority moves its entry in place (no stale entries)
+
+    Heap entries are plain (priority, tie, item) tuples so comparisons stay
+    in C; best-known priorities and heap positions live in flat per-item tables.
     """
 
-    def __init__(self):
-        self._heap: List[_PQItem[T]] = []
+    def __init__(self, n: int):
+        self._heap: List[Tuple[float, int, int]] = []
         self._tie = 0
-        self._best: Dict[T, float] = {}
-
-    def push(self, item: T, priority: float) -> None:
-        best = self._best.get(item)
-        if best is None or priority < best:
-            self._best[item] = priority
-            heapq.heappush(self._heap, _PQItem(priority=priority, tie=self._tie, item=item))
-            self._tie += 1
-
-    def pop(self) -> Tuple[T, float]:
-        while self._heap:
-            top = heapq.heappop(self._heap)
-            # discard stale entries
-            if self._best.get(top.item) == top.priority:
-                return top.item, top.priority
-        raise IndexError("pop from empty PriorityQueue")
+        # flat lists rather than ndarrays: scalar list indexing is faster from Python
+        self._best: List[float] = [_INF] * n  # best pushed priority per item (inf = never pushed)
+        self._pos: List[int] = [-1] * n       # heap slot per item (-1 = not queued)
+
+    def push(self, item: int, priority: float) -> None:
+        best = self._best[item]
+        if not priority < best:
+            return
+        self._best[item] = priority
+
+        # a decreased key takes a fresh tie, as if it were a new entry
+        entry = (priority, self._tie, item)
+        self._tie += 1
+        k = self._pos[item]
+        if k < 0:
+            k = len(self._heap)
+            self._heap.append(entry)
+        self._sift_up(k, entry)
+
+    def pop(self) -> Tuple[int, float]:
+        heap = self._heap
+        if not heap:
+            raise IndexError("pop from empty PriorityQueue")
+        priority, _, item = heap[0]
+        last = heap.pop()
+        self._pos[item] = -1
+        if heap:
+            self._sift_down(0, last)
+        return item, priority
+
+    def _sift_up(self, k: int, entry: Tuple[float, int, int]) -> None:
+        heap, pos = self._heap, self._pos
+        while k > 0:
+            p = (k - 1) >> 1
+            parent = heap[p]
+            if parent < entry:
+                break
+            heap[k] = parent
+            pos[parent[2]] = k
+            k = p
+        heap[k] = entry
+        pos[entry[2]] = k
+
+    def _sift_down(self, k: int, entry: Tuple[float, int, int]) -> None:
+        heap, pos = self._heap, self._pos
+        n = len(heap)
+        while True:
+            c = 2 * k + 1
+            if c >= n:
+                break
+            if c + 1 < n and heap[c + 1] < heap[c]:
+                c += 1
+            child = heap[c]
+            if entry < child:
+                break
+            heap[k] = child
+            pos[child[2]] = k
+            k = c
+        heap[k] = entry
+        pos[entry[2]] = k
 
     def empty(self) -> bool:
-        return len(self._best) == 0 or all(
-            self._best.get(it.item) != it.priority for it in self._heap
-        )
+        return not self._heap
 
     def __len__(self) -> int:
-        # approximate current (includes stale in heap, but best dict is true active set)
-        return len(self._best)
+        # one heap entry per queued item, so this is the exact active count
+        return len(self._heap)
 
-    def peek_priority(self, item: T) -> Optional[float]:
-        return self._best.get(item)
\ No newline at end of file
+    def peek_priority(self, item: int) -> Optional[float]:
+        best = self._best[item]
+        return None if best == _INF else best
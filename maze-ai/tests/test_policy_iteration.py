@@ -0,0 +1,45 @@
+# tests/test_policy_iteration.py
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from analytics.metrics import RunMetrics
+from maze.env import MazeEnv
+from maze.generator import generate_maze
+from solvers.policy_iteration import solve_policy_iteration
+
+
+def _solve(**kwargs):
+    env = MazeEnv(generate_maze(11, 11, seed=0))
+    metrics = RunMetrics(algorithm="policy", maze_rows=11, maze_cols=11, random_seed=0)
+    result = solve_policy_iteration(env, metrics, **kwargs)
+    return result, metrics
+
+
+def test_k_eval_truncates_evaluation_with_scipy_installed():
+    pytest.importorskip("scipy")
+    full, full_m = _solve(k_eval=None)
+    short, short_m = _solve(k_eval=2)
+
+    assert full_m.solved and short_m.solved
+    assert short.path == full.path
+    # truncation changes how much evaluation runs, not the policy it finds
+    assert short_m.policy_evaluation_steps < full_m.policy_evaluation_steps
+
+
+def test_linear_evaluation_matches_sweeps():
+    pytest.importorskip("scipy")
+    sweeps, _ = _solve(k_eval=None)
+    linear, linear_m = _solve(k_eval=None, evaluation="linear")
+
+    assert linear.path == sweeps.path
+    assert linear_m.policy_evaluation_steps == linear_m.policy_iteration_steps
+
+
+def test_linear_evaluation_rejects_k_eval():
+    pytest.importorskip("scipy")
+    with pytest.raises(ValueError):
+        _solve(k_eval=20, evaluation="linear")